@@ -1,12 +1,25 @@
 from __future__ import annotations
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from multiprocessing import get_context
+from operator import itemgetter
 from pathlib import Path
+import datetime as dt
+import hashlib
+import json
+import os
 import re
-from typing import Dict, List, Tuple
+import time
+from string import ascii_uppercase
+from typing import Callable, Dict, List, Tuple
 from openpyxl import load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
-# Filename pattern: metadata_RUNNAME_YYYYMMDD.xlsx or metadata_RUNNAME_YYYYMMDD_xxx.xlsx
-FILENAME_REGEX = re.compile(r"^metadata_(?P<run>[A-Za-z0-9_-]+)_(?P<date>20\d{6})(?:_.*)?\.xlsx$", re.IGNORECASE)
+from Backend.process_pool import use_process_pool
+
+# Filename pattern (matched with fullmatch): metadata_RUNNAME_YYYYMMDD.xlsx or metadata_RUNNAME_YYYYMMDD_xxx.xlsx
+FILENAME_REGEX = re.compile(r"metadata_(?P<run>[A-Za-z0-9_-]+)_(?P<date>20\d{6})(?:_.*)?\.xlsx", re.IGNORECASE)
 
 # Source sheet & positions (1-based Excel rows/cols)
 SOURCE_SHEET = "Sample"
@@ -19,7 +32,7 @@ AVITI_START_ROW = 16  # data starts on Aviti Manifest sheet
 AVITI_TEST_START_ROW = 24  # data starts on Aviti Manifest TEST sheet
 
 
-def _sampleimport_col_k_formula(sample_row: int) -> str:
+def _build_sampleimport_col_k_formula(sample_row: str) -> str:
     # Build nested IF per business rules, referencing Sample sheet row.
     return (
         f"=IF(AND(OR(LEFT(Sample!A{sample_row},1)=\"E\",LEFT(Sample!A{sample_row},1)=\"H\",LEFT(Sample!A{sample_row},1)=\"T\","  # TS1
@@ -40,6 +53,22 @@ def _sampleimport_col_k_formula(sample_row: int) -> str:
         f"IF(LEFT(Sample!A{sample_row},2)=\"CR\",\"CARRIER9\",IF(LEFT(Sample!A{sample_row},4)=\"DEL3\",\"NIPTDEL3\",Sample!A{sample_row}))))))))"  # default
     )
 
+
+def _build_reverse30_formula(ref: str) -> str:
+    # Reverse the first 30 characters of the referenced cell, one MID per position.
+    return "=" + "&".join(f"MID({ref},{pos},1)" for pos in range(30, 0, -1))
+
+
+# Long per-row formulas are built once with a "{r}" row placeholder; filling in the
+# row is then a single str.replace instead of re-running dozens of f-string fields.
+_SAMPLEIMPORT_COL_K_TEMPLATE = _build_sampleimport_col_k_formula("{r}")
+_AVITI_COL_C_TEMPLATE = _build_reverse30_formula("I{r}")
+_AVITI_TEST_COL_I_TEMPLATE = _build_reverse30_formula("O{r}")
+
+
+def _sampleimport_col_k_formula(sample_row: int) -> str:
+    return _SAMPLEIMPORT_COL_K_TEMPLATE.replace("{r}", str(sample_row))
+
 # Column mapping (source → template)
 # Excel letters to letters; we’ll convert to column indices when writing.
 COLUMN_MAP = {
@@ -68,6 +97,32 @@ COLUMN_MAP = {
 CHECK_PRIMERS_COL = "V"
 CHECK_LABCODES_COL = "W"
 
+# A parsed Sample row: one value per COLUMN_MAP source column, in COLUMN_MAP order.
+SampleRecord = Tuple[object, ...]
+
+# Parsed Sample rows are cached under <output>/.cache/<source key>, one folder per
+# source folder, keyed on each source file's content hash. Bump the version
+# whenever the cached row format changes.
+# Entries are plain JSON: the output folder may be shared, and loading a cache
+# entry must not be able to run code.
+CACHE_DIR_NAME = ".cache"
+_CACHE_VERSION = 1
+# Caches of other source folders that no combine has used for this long are removed.
+CACHE_MAX_AGE_DAYS = 30
+# Every file and folder the cache writes (entries and their temp files), so pruning
+# never touches anything else a user keeps in the folder.
+_CACHE_FILE_RE = re.compile(r"[0-9a-f]{64}_v\d+\.json(?:\.\d+\.tmp)?")
+_CACHE_SUBDIR_RE = re.compile(r"[0-9a-f]{16}")
+
+# Cell values JSON cannot hold are stored as {tag: value}; openpyxl returns these
+# types for date/time formatted cells.
+_CELL_DECODERS: Dict[str, Callable[[object], object]] = {
+    "$datetime": dt.datetime.fromisoformat,
+    "$date": dt.date.fromisoformat,
+    "$time": dt.time.fromisoformat,
+    "$timedelta": lambda parts: dt.timedelta(*parts),
+}
+
 
 def _validate_inputs(source_folder: str, output_folder: str, template_file: str) -> Tuple[Path, Path, Path]:
     src = Path(source_folder)
@@ -83,53 +138,150 @@ def _validate_inputs(source_folder: str, output_folder: str, template_file: str)
     return src, out, tpl
 
 
-def _iter_metadata_files(src: Path) -> List[Path]:
-    files: List[Path] = []
-    for path in src.glob("*.xlsx"):
-        if path.name.startswith("~$"):
-            continue  # skip Excel temp files
-        if FILENAME_REGEX.match(path.name):
-            files.append(path)
-    return files
-
+def _discover_groups(src: Path) -> Dict[Tuple[str, str], List[Path]]:
+    """Find metadata_*.xlsx files in ``src`` and group them by (run, date).
 
-def _group_by_run_date(files: List[Path]) -> Dict[Tuple[str, str], List[Path]]:
+    Each name is matched once; the same match supplies the group key.
+    """
     groups: Dict[Tuple[str, str], List[Path]] = {}
-    for f in files:
-        m = FILENAME_REGEX.match(f.name)
-        if not m:
-            continue
-        key = (m.group("run"), m.group("date"))
-        groups.setdefault(key, []).append(f)
+    # One scandir pass; the filename regex already requires the .xlsx suffix.
+    with os.scandir(src) as entries:
+        for entry in entries:
+            if entry.name.startswith("~$"):
+                continue  # skip Excel temp files
+            m = FILENAME_REGEX.fullmatch(entry.name)
+            if not m or not entry.is_file():
+                continue
+            key = (m.group("run"), m.group("date"))
+            groups.setdefault(key, []).append(Path(entry.path))
     return groups
 
 
-def _read_sample_rows(path: Path) -> List[Dict[str, object]]:
+def _read_sample_rows(path: Path) -> List[SampleRecord]:
     wb = load_workbook(path, data_only=False, read_only=True)
     if SOURCE_SHEET not in wb.sheetnames:
         wb.close()
         return []
     ws: Worksheet = wb[SOURCE_SHEET]
 
-    rows: List[Dict[str, object]] = []
-    for row in ws.iter_rows(min_row=SAMPLE_START_ROW):
+    rows: List[SampleRecord] = []
+    # values_only streams plain values and skips building a Cell per entry;
+    # max_col stops each row at the last mapped column, and openpyxl pads short
+    # rows with None up to it, so every mapped position is always present.
+    for row in ws.iter_rows(min_row=SAMPLE_START_ROW, max_col=_SOURCE_MAX_COL, values_only=True):
         # stop when LABCODE (col C) is empty; this matches “đến hết labcode thì thôi”
-        if len(row) >= 3:
-            labcode_val = row[2].value  # column C
-            if labcode_val is None or (isinstance(labcode_val, str) and labcode_val.strip() == ""):
-                break
-        record: Dict[str, object] = {}
-        for col_letter in COLUMN_MAP.keys():
-            col_idx = _col_letter_to_index(col_letter) - 1  # zero-based index in row tuple
-            if col_idx < len(row):
-                record[col_letter] = row[col_idx].value
-            else:
-                record[col_letter] = None
-        rows.append(record)
+        labcode_val = row[2]  # column C
+        if labcode_val is None or (isinstance(labcode_val, str) and labcode_val.strip() == ""):
+            break
+        rows.append(_get_source_values(row))
     wb.close()
     return rows
 
 
+def _encode_cell(value: object) -> Dict[str, object]:
+    # json.dumps calls this only for values it cannot encode itself.
+    # datetime is checked before date because it is a date subclass.
+    if isinstance(value, dt.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, dt.date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, dt.time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, dt.timedelta):
+        return {"$timedelta": [value.days, value.seconds, value.microseconds]}
+    raise TypeError(f"Cannot cache cell value of type {type(value).__name__}")
+
+
+def _decode_cell(obj: Dict[str, object]) -> object:
+    # Raises ValueError / KeyError / TypeError on anything but a single known tag
+    # with a well-formed value.
+    ((tag, raw),) = obj.items()
+    return _CELL_DECODERS[tag](raw)
+
+
+def _read_sample_rows_cached(path: Path, cache_dir: Path) -> Tuple[List[SampleRecord], str]:
+    """``_read_sample_rows`` backed by a JSON cache keyed on the file's SHA-256.
+
+    Hashing the bytes is far cheaper than unzipping and parsing the workbook, so
+    re-running a combine over unchanged sources skips openpyxl entirely.
+    Returns the rows and the name of the cache entry that holds them.
+    """
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    cache_name = f"{digest}_v{_CACHE_VERSION}.json"
+    cache_file = cache_dir / cache_name
+    try:
+        data = json.loads(cache_file.read_text(encoding="utf-8"), object_hook=_decode_cell)
+        # Anything but a list of rows is a foreign entry; rebuild it like a bad one.
+        if isinstance(data, list) and all(isinstance(row, list) for row in data):
+            return [tuple(row) for row in data], cache_name
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing, unreadable, truncated or malformed entry; rebuild it below
+
+    rows = _read_sample_rows(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(rows, default=_encode_cell, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError):
+        pass  # caching is best-effort; never fail the combine over it
+    return rows, cache_name
+
+
+def _source_cache_dir(out: Path, src: Path) -> Path:
+    """Cache folder for one source folder, so each source folder prunes only its own entries."""
+    key = hashlib.sha256(os.path.normcase(str(src.resolve())).encode("utf-8")).hexdigest()[:16]
+    return out / CACHE_DIR_NAME / key
+
+
+def _remove_cache_files(folder: str, keep: set) -> None:
+    # Best-effort: a file another run is using or that is already gone is left alone.
+    try:
+        with os.scandir(folder) as entries:
+            stale = [e.path for e in entries if e.name not in keep and _CACHE_FILE_RE.fullmatch(e.name)]
+    except OSError:
+        return  # no cache folder yet (or unreadable); nothing to prune
+    for stale_path in stale:
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+
+
+def _prune_cache(cache_dir: Path, keep: set) -> None:
+    """Delete this source folder's entries not in ``keep`` and other source folders' stale caches.
+
+    ``keep`` holds the entries this run used; anything else in ``cache_dir`` belongs to
+    sources that changed or were removed. Sibling caches (other source folders sharing
+    the output folder) are left alone until unused for CACHE_MAX_AGE_DAYS.
+    """
+    _remove_cache_files(str(cache_dir), keep)
+    try:
+        os.utime(cache_dir)  # mark this source folder's cache as recently used
+    except OSError:
+        pass
+
+    cutoff = time.time() - CACHE_MAX_AGE_DAYS * 86400
+    try:
+        with os.scandir(cache_dir.parent) as entries:
+            expired = [
+                e.path
+                for e in entries
+                if e.name != cache_dir.name
+                and _CACHE_SUBDIR_RE.fullmatch(e.name)
+                and e.is_dir()
+                and e.stat().st_mtime < cutoff
+            ]
+    except OSError:
+        return
+    for folder in expired:
+        _remove_cache_files(folder, set())
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass  # still holds files the cache did not write
+
+
 def _col_letter_to_index(letter: str) -> int:
     """Convert Excel column letter (A=1) to index."""
     result = 0
@@ -138,166 +290,150 @@ def _col_letter_to_index(letter: str) -> int:
     return result
 
 
+# Every one- and two-letter column (A..ZZ), converted once at import.
+_LETTER_TO_INDEX: Dict[str, int] = {
+    letter: _col_letter_to_index(letter)
+    for letter in (*ascii_uppercase, *(a + b for a in ascii_uppercase for b in ascii_uppercase))
+}
+
+
 def _index_from_letter(letter: str) -> int:
     """Excel letter to 1-based column number."""
-    return _col_letter_to_index(letter)
+    index = _LETTER_TO_INDEX.get(letter)
+    return index if index is not None else _col_letter_to_index(letter)
+
 
+# (letter, zero-based position in a row tuple) for every source column, resolved once.
+_SOURCE_COLUMNS: Tuple[Tuple[str, int], ...] = tuple(
+    (col_letter, _col_letter_to_index(col_letter) - 1) for col_letter in COLUMN_MAP
+)
+# Right-most source column (U); nothing beyond it is read.
+_SOURCE_MAX_COL = max(col_idx for _, col_idx in _SOURCE_COLUMNS) + 1
+# Pulls every source column out of a row tuple in one call, in COLUMN_MAP order.
+_get_source_values = itemgetter(*(col_idx for _, col_idx in _SOURCE_COLUMNS))
+# Positions of specific source columns within a SampleRecord.
+_RECORD_LABCODE = list(COLUMN_MAP).index("C")
+_RECORD_PRIMERS = list(COLUMN_MAP).index("T")
 
-def _compute_duplicates(rows: List[Dict[str, object]]) -> Tuple[set, set]:
-    primers_count: Dict[str, int] = {}
-    labcode_count: Dict[str, int] = {}
 
-    def _bump(counter: Dict[str, int], val: object):
+def _compute_duplicates(rows: List[SampleRecord]) -> Tuple[set, set]:
+    def _clean(val: object) -> str | None:
         if val is None:
-            return
-        s = str(val).strip()
-        if s == "":
-            return
-        counter[s] = counter.get(s, 0) + 1
+            return None
+        return str(val).strip() or None
 
-    for r in rows:
-        _bump(primers_count, r.get("T"))  # Primers
-        _bump(labcode_count, r.get("C"))  # LABCODE
+    primers_count = Counter(s for s in (_clean(r[_RECORD_PRIMERS]) for r in rows) if s)
+    labcode_count = Counter(s for s in (_clean(r[_RECORD_LABCODE]) for r in rows) if s)
 
     dup_primers = {k for k, v in primers_count.items() if v > 1}
     dup_labcodes = {k for k, v in labcode_count.items() if v > 1}
     return dup_primers, dup_labcodes
 
 
-def _write_group(run: str, date: str, rows: List[Dict[str, object]], template_file: Path, output_dir: Path) -> Path:
-    # Fresh load of template to avoid touching the original
-    wb = load_workbook(template_file, data_only=False)
-    if SOURCE_SHEET not in wb.sheetnames:
-        wb.close()
-        raise ValueError(f"Template missing sheet: {SOURCE_SHEET}")
-    if IMPORT_SHEET not in wb.sheetnames:
-        wb.close()
-        raise ValueError(f"Template missing sheet: {IMPORT_SHEET}")
-    if AVITI_SHEET not in wb.sheetnames:
-        wb.close()
-        raise ValueError(f"Template missing sheet: {AVITI_SHEET}")
-    if AVITI_TEST_SHEET not in wb.sheetnames:
-        wb.close()
-        raise ValueError(f"Template missing sheet: {AVITI_TEST_SHEET}")
+def _plan_cells(rows: List[SampleRecord]) -> Dict[str, List[Tuple[int, int, object]]]:
+    """Compute every (row, column, value) the output needs, grouped by template sheet.
 
-    sample_ws: Worksheet = wb[SOURCE_SHEET]
-    import_ws: Worksheet = wb[IMPORT_SHEET]
-    aviti_ws: Worksheet = wb[AVITI_SHEET]
-    aviti_test_ws: Worksheet = wb[AVITI_TEST_SHEET]
-
-    dup_primers, dup_labcodes = _compute_duplicates(rows)
+    This is pure Python and never touches openpyxl; _apply_plan does the writing.
+    """
+    col = _LETTER_TO_INDEX  # column letter -> 1-based index
+    # Destination column for each SampleRecord position
+    sample_targets = [col[dst_col] for dst_col in COLUMN_MAP.values()]
 
-    sample_start_row = SAMPLE_START_ROW
-    import_start_row = IMPORT_START_ROW
-    aviti_start_row = AVITI_START_ROW
-    aviti_test_start_row = AVITI_TEST_START_ROW
+    sample_cells: List[Tuple[int, int, object]] = []
+    import_cells: List[Tuple[int, int, object]] = []
+    aviti_cells: List[Tuple[int, int, object]] = []
+    aviti_test_cells: List[Tuple[int, int, object]] = []
 
     for offset, record in enumerate(rows):
-        sample_row = sample_start_row + offset
-        import_row = import_start_row + offset
-        aviti_row = aviti_start_row + offset
-        aviti_test_row = aviti_test_start_row + offset
-        # Write mapped columns on Sample sheet
-        for src_col, dst_col in COLUMN_MAP.items():
-            val = record.get(src_col)
-            cell = sample_ws.cell(row=sample_row, column=_index_from_letter(dst_col))
-            cell.value = val
-            if dst_col == "I":
-                cell.number_format = "DD/MM/YYYY"
-
-        # Fill formula in col K to lookup i7 index from Primers (col T)
-        sample_ws.cell(row=sample_row, column=_index_from_letter("K")).value = (
-            f"=VLOOKUP(T{sample_row},'Index Sets'!$A$2:$C$4000,2,FALSE)"
+        sample_row = SAMPLE_START_ROW + offset
+        import_row = IMPORT_START_ROW + offset
+        aviti_row = AVITI_START_ROW + offset
+        aviti_test_row = AVITI_TEST_START_ROW + offset
+        sample_id = f"=Sample!B{sample_row}&\"-\"&Sample!C{sample_row}"
+        # SampleImport col I with bases complemented (A<->T, C<->G)
+        complement = (
+            f"=SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SampleImport!I{import_row},\"A\",1),\"C\",2),\"G\",3),\"T\",4),1,\"T\"),2,\"G\"),3,\"C\"),4,\"A\")"
         )
 
-        # SampleImport formulas
-        import_ws.cell(row=import_row, column=_index_from_letter("A")).value = (
-            f"=Sample!B{sample_row}&\"-\"&Sample!C{sample_row}"
-        )
-        import_ws.cell(row=import_row, column=_index_from_letter("B")).value = (
-            f"=Sample!B{sample_row}&\"-\"&Sample!C{sample_row}"
+        # Mapped columns on Sample sheet
+        sample_cells.extend((sample_row, dst_idx, value) for dst_idx, value in zip(sample_targets, record))
+        sample_cells += (
+            # Formula in col K to lookup i7 index from Primers (col T)
+            (sample_row, col["K"], f"=VLOOKUP(T{sample_row},'Index Sets'!$A$2:$C$4000,2,FALSE)"),
+            # Clear markers; no Y/N output requested
+            (sample_row, col[CHECK_PRIMERS_COL], ""),
+            (sample_row, col[CHECK_LABCODES_COL], ""),
         )
-        import_ws.cell(row=import_row, column=_index_from_letter("C")).value = (
-            f"=Sample!A{sample_row}"
-        )
-        import_ws.cell(row=import_row, column=_index_from_letter("F")).value = (
-            f"=Sample!K{sample_row}"
-        )
-        import_ws.cell(row=import_row, column=_index_from_letter("G")).value = (
-            f"=VLOOKUP(F{import_row},'Index Sequence'!$A$2:$B$10000,2,FALSE)"
-        )
-        import_ws.cell(row=import_row, column=_index_from_letter("H")).value = (
-            f"=Sample!L{sample_row}"
-        )
-        import_ws.cell(row=import_row, column=_index_from_letter("I")).value = (
-            f"=VLOOKUP(H{import_row},'Index Sequence'!$A$2:$B$10000,2,FALSE)"
+
+        # SampleImport formulas
+        import_cells += (
+            (import_row, col["A"], sample_id),
+            (import_row, col["B"], sample_id),
+            (import_row, col["C"], f"=Sample!A{sample_row}"),
+            (import_row, col["F"], f"=Sample!K{sample_row}"),
+            (import_row, col["G"], f"=VLOOKUP(F{import_row},'Index Sequence'!$A$2:$B$10000,2,FALSE)"),
+            (import_row, col["H"], f"=Sample!L{sample_row}"),
+            (import_row, col["I"], f"=VLOOKUP(H{import_row},'Index Sequence'!$A$2:$B$10000,2,FALSE)"),
+            (import_row, col["K"], _sampleimport_col_k_formula(sample_row)),
         )
-        import_ws.cell(row=import_row, column=_index_from_letter("K")).value = _sampleimport_col_k_formula(sample_row)
 
         # Aviti Manifest formulas
-        aviti_ws.cell(row=aviti_row, column=_index_from_letter("A")).value = (
-            f"=SampleImport!A{import_row}"
-        )
-        aviti_ws.cell(row=aviti_row, column=_index_from_letter("B")).value = (
-            f"=SampleImport!G{import_row}"
-        )
-        # Reverse string in SampleImport col I (positions 1..30) into Aviti col C
-        aviti_ws.cell(row=aviti_row, column=_index_from_letter("C")).value = (
-            f"=MID(I{aviti_row},30,1)&MID(I{aviti_row},29,1)&MID(I{aviti_row},28,1)&MID(I{aviti_row},27,1)&"
-            f"MID(I{aviti_row},26,1)&MID(I{aviti_row},25,1)&MID(I{aviti_row},24,1)&MID(I{aviti_row},23,1)&"
-            f"MID(I{aviti_row},22,1)&MID(I{aviti_row},21,1)&MID(I{aviti_row},20,1)&MID(I{aviti_row},19,1)&"
-            f"MID(I{aviti_row},18,1)&MID(I{aviti_row},17,1)&MID(I{aviti_row},16,1)&MID(I{aviti_row},15,1)&"
-            f"MID(I{aviti_row},14,1)&MID(I{aviti_row},13,1)&MID(I{aviti_row},12,1)&MID(I{aviti_row},11,1)&"
-            f"MID(I{aviti_row},10,1)&MID(I{aviti_row},9,1)&MID(I{aviti_row},8,1)&MID(I{aviti_row},7,1)&"
-            f"MID(I{aviti_row},6,1)&MID(I{aviti_row},5,1)&MID(I{aviti_row},4,1)&MID(I{aviti_row},3,1)&"
-            f"MID(I{aviti_row},2,1)&MID(I{aviti_row},1,1)"
-        )
-        aviti_ws.cell(row=aviti_row, column=_index_from_letter("D")).value = (
-            f"=SampleImport!K{import_row}"
-        )
-        aviti_ws.cell(row=aviti_row, column=_index_from_letter("I")).value = (
-            f"=SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SampleImport!I{import_row},\"A\",1),\"C\",2),\"G\",3),\"T\",4),1,\"T\"),2,\"G\"),3,\"C\"),4,\"A\")"
+        aviti_cells += (
+            (aviti_row, col["A"], f"=SampleImport!A{import_row}"),
+            (aviti_row, col["B"], f"=SampleImport!G{import_row}"),
+            # Reverse string in Aviti col I (positions 1..30) into col C
+            (aviti_row, col["C"], _AVITI_COL_C_TEMPLATE.replace("{r}", str(aviti_row))),
+            (aviti_row, col["D"], f"=SampleImport!K{import_row}"),
+            (aviti_row, col["I"], complement),
         )
 
         # Aviti Manifest TEST formulas (start row 24)
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("A")).value = (
-            f"=Sample!B{sample_row}&\"-\"&Sample!C{sample_row}"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("B")).value = (
-            f"=Sample!B{sample_row}&\"-\"&Sample!C{sample_row}"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("C")).value = (
-            f"=Sample!A{sample_row}"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("F")).value = (
-            f"=Sample!K{sample_row}"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("G")).value = (
-            f"=VLOOKUP(F{aviti_test_row},'Index Sequence'!$A$2:$B$9808,2,FALSE)"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("H")).value = (
-            f"=Sample!L{sample_row}"
-        )
-        # O column depends on SampleImport col I
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("O")).value = (
-            f"=SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SUBSTITUTE(SampleImport!I{import_row},\"A\",1),\"C\",2),\"G\",3),\"T\",4),1,\"T\"),2,\"G\"),3,\"C\"),4,\"A\")"
-        )
-        aviti_test_ws.cell(row=aviti_test_row, column=_index_from_letter("I")).value = (
-            f"=MID(O{aviti_test_row},30,1)&MID(O{aviti_test_row},29,1)&MID(O{aviti_test_row},28,1)&MID(O{aviti_test_row},27,1)&"
-            f"MID(O{aviti_test_row},26,1)&MID(O{aviti_test_row},25,1)&MID(O{aviti_test_row},24,1)&MID(O{aviti_test_row},23,1)&"
-            f"MID(O{aviti_test_row},22,1)&MID(O{aviti_test_row},21,1)&MID(O{aviti_test_row},20,1)&MID(O{aviti_test_row},19,1)&"
-            f"MID(O{aviti_test_row},18,1)&MID(O{aviti_test_row},17,1)&MID(O{aviti_test_row},16,1)&MID(O{aviti_test_row},15,1)&"
-            f"MID(O{aviti_test_row},14,1)&MID(O{aviti_test_row},13,1)&MID(O{aviti_test_row},12,1)&MID(O{aviti_test_row},11,1)&"
-            f"MID(O{aviti_test_row},10,1)&MID(O{aviti_test_row},9,1)&MID(O{aviti_test_row},8,1)&MID(O{aviti_test_row},7,1)&"
-            f"MID(O{aviti_test_row},6,1)&MID(O{aviti_test_row},5,1)&MID(O{aviti_test_row},4,1)&MID(O{aviti_test_row},3,1)&"
-            f"MID(O{aviti_test_row},2,1)&MID(O{aviti_test_row},1,1)"
+        aviti_test_cells += (
+            (aviti_test_row, col["A"], sample_id),
+            (aviti_test_row, col["B"], sample_id),
+            (aviti_test_row, col["C"], f"=Sample!A{sample_row}"),
+            (aviti_test_row, col["F"], f"=Sample!K{sample_row}"),
+            (aviti_test_row, col["G"], f"=VLOOKUP(F{aviti_test_row},'Index Sequence'!$A$2:$B$9808,2,FALSE)"),
+            (aviti_test_row, col["H"], f"=Sample!L{sample_row}"),
+            # O column depends on SampleImport col I; I reverses O
+            (aviti_test_row, col["O"], complement),
+            (aviti_test_row, col["I"], _AVITI_TEST_COL_I_TEMPLATE.replace("{r}", str(aviti_test_row))),
         )
 
-        primers_val = record.get("T")
-        labcode_val = record.get("C")
-        # Clear markers; no Y/N output requested
-        sample_ws.cell(row=sample_row, column=_index_from_letter(CHECK_PRIMERS_COL)).value = ""
-        sample_ws.cell(row=sample_row, column=_index_from_letter(CHECK_LABCODES_COL)).value = ""
+    return {
+        SOURCE_SHEET: sample_cells,
+        IMPORT_SHEET: import_cells,
+        AVITI_SHEET: aviti_cells,
+        AVITI_TEST_SHEET: aviti_test_cells,
+    }
+
+
+def _apply_plan(wb, plan: Dict[str, List[Tuple[int, int, object]]]) -> None:
+    """Write a _plan_cells result into the matching worksheets of ``wb``."""
+    for sheet_name, cells in plan.items():
+        ws: Worksheet = wb[sheet_name]
+        cell = ws.cell
+        for row, column, value in cells:
+            # Plain assignment (not cell(value=...)) so None still clears template cells.
+            cell(row=row, column=column).value = value
+
+
+def _write_group(run: str, date: str, rows: List[SampleRecord], template_bytes: bytes, output_dir: Path) -> Path:
+    # Fresh load of template (from the bytes read once by run_export) to avoid touching the original
+    wb = load_workbook(BytesIO(template_bytes), data_only=False)
+    for sheet_name in (SOURCE_SHEET, IMPORT_SHEET, AVITI_SHEET, AVITI_TEST_SHEET):
+        if sheet_name not in wb.sheetnames:
+            wb.close()
+            raise ValueError(f"Template missing sheet: {sheet_name}")
+
+    dup_primers, dup_labcodes = _compute_duplicates(rows)
+
+    _apply_plan(wb, _plan_cells(rows))
+
+    sample_ws: Worksheet = wb[SOURCE_SHEET]
+    date_col = _index_from_letter(COLUMN_MAP["I"])  # Library Date
+    for sample_row in range(SAMPLE_START_ROW, SAMPLE_START_ROW + len(rows)):
+        sample_ws.cell(row=sample_row, column=date_col).number_format = "DD/MM/YYYY"
 
     out_path = output_dir / f"{run}_{date}.xlsx"
     wb.save(out_path)
@@ -305,38 +441,112 @@ def _write_group(run: str, date: str, rows: List[Dict[str, object]], template_fi
     return out_path
 
 
-def run_export(source_folder: str, output_folder: str, template_file: str) -> List[Path]:
+def _process_group(
+    run: str,
+    date: str,
+    paths: List[Path],
+    template_bytes: bytes,
+    output_dir: Path,
+    cache_dir: Path | None = None,
+    file_done_cb: Callable[[], None] | None = None,
+) -> Tuple[Path, List[str]]:
+    """Read every source file of one (run, date) group and write its output workbook.
+
+    Kept at module level so it can be pickled into worker processes. Returns the
+    output path and the names of the cache entries the group used.
+    ``file_done_cb`` (in-process runs only) is called after each source file is read.
+    """
+    group_rows: List[SampleRecord] = []
+    cache_names: List[str] = []
+    for p in paths:
+        if cache_dir is None:
+            group_rows.extend(_read_sample_rows(p))
+        else:
+            rows, cache_name = _read_sample_rows_cached(p, cache_dir)
+            group_rows.extend(rows)
+            cache_names.append(cache_name)
+        if file_done_cb:
+            file_done_cb()
+
+    if not group_rows:
+        # If no rows, still emit an empty data section but preserve template.
+        # Saved through openpyxl like other groups, so an .xlsm (or otherwise
+        # non-plain) template still yields a valid .xlsx.
+        out_path = output_dir / f"{run}_{date}.xlsx"
+        wb = load_workbook(BytesIO(template_bytes), data_only=False)
+        wb.save(out_path)
+        wb.close()
+        return out_path, cache_names
+
+    return _write_group(run, date, group_rows, template_bytes, output_dir), cache_names
+
+
+def run_export(
+    source_folder: str,
+    output_folder: str,
+    template_file: str,
+    use_cache: bool = True,
+    progress_cb: Callable[[float], None] | None = None,
+) -> List[Path]:
     """
     Entry point for the combie UI.
     - source_folder: folder containing metadata_*.xlsx files
     - output_folder: destination folder (created if missing)
     - template_file: Excel template to copy & fill
+    - use_cache: reuse parsed rows of unchanged sources from <output>/.cache
+      (entries for sources that changed or are gone are removed afterwards; each
+      source folder has its own cache, dropped after CACHE_MAX_AGE_DAYS unused)
+    - progress_cb: called with the percentage done. In-process runs report after
+      each source file is read and each group is written (steps_done / steps);
+      process-pool runs report groups_done / groups after each group.
     Returns list of generated file paths.
     """
     src, out, tpl = _validate_inputs(source_folder, output_folder, template_file)
+    cache_dir = _source_cache_dir(out, src) if use_cache else None
 
-    files = _iter_metadata_files(src)
-    if not files:
+    groups = _discover_groups(src)
+    if not groups:
         raise FileNotFoundError("No matching metadata files found in source_folder.")
 
-    groups = _group_by_run_date(files)
-    outputs: List[Path] = []
-
-    for (run, date), paths in groups.items():
-        group_rows: List[Dict[str, object]] = []
-        for p in paths:
-            group_rows.extend(_read_sample_rows(p))
-
-        if not group_rows:
-            # If no rows, still emit an empty data section but preserve template
-            out_path = out / f"{run}_{date}.xlsx"
-            wb = load_workbook(tpl, data_only=False)
-            wb.save(out_path)
-            wb.close()
-            outputs.append(out_path)
-            continue
-
-        out_path = _write_group(run, date, group_rows, tpl, out)
-        outputs.append(out_path)
-
-    return outputs
\ No newline at end of file
+    # Read the template once; every group loads its own workbook from these bytes.
+    tpl_bytes = tpl.read_bytes()
+
+    total = len(groups)
+
+    # Groups are independent, so spread them over processes; a single group or
+    # a small run is not worth the worker start-up cost.
+    source_bytes = sum(p.stat().st_size for paths in groups.values() for p in paths)
+    workers = min(total, os.cpu_count() or 1)
+    if not use_process_pool(workers, source_bytes):
+        # One step per source file read plus one per group written, so a single large
+        # group still moves the bar file by file.
+        steps = sum(len(paths) for paths in groups.values()) + total
+        done_steps = 0
+
+        def _step() -> None:
+            nonlocal done_steps
+            done_steps += 1
+            if progress_cb:
+                progress_cb(done_steps / steps * 100)
+
+        group_results: List[Tuple[Path, List[str]]] = []
+        for (run, date), paths in groups.items():
+            group_results.append(_process_group(run, date, paths, tpl_bytes, out, cache_dir, _step))
+            _step()
+    else:
+        # spawn (not fork): run_export is called from a UI worker thread.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_process_group, run, date, paths, tpl_bytes, out, cache_dir)
+                for (run, date), paths in groups.items()
+            ]
+            # Callbacks cannot cross processes, so the pool reports per finished group.
+            for done, _ in enumerate(as_completed(futures), start=1):
+                if progress_cb:
+                    progress_cb(done / total * 100)
+            # Results keep group order; result() re-raises a failed group's error.
+            group_results = [future.result() for future in futures]
+
+    if cache_dir is not None:
+        _prune_cache(cache_dir, {name for _, names in group_results for name in names})
+    return [out_path for out_path, _ in group_results]
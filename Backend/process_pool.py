@@ -0,0 +1,16 @@
+"""When Combine and Convert spread their work over spawned worker processes.
+
+Kept free of openpyxl so the Convert screen can import it without paying for it.
+"""
+
+# Below this much source data (total .xlsx bytes) a job runs in-process: each
+# spawned worker costs ~0.3-0.5 s to start and re-import openpyxl, about what
+# parsing this many bytes takes. Worker processes also need the app's entry
+# point to be guarded by ``if __name__ == "__main__"`` (and
+# multiprocessing.freeze_support() in a frozen build); see Fontend/main.py.
+POOL_MIN_SOURCE_BYTES = 512 * 1024
+
+
+def use_process_pool(workers: int, source_bytes: int) -> bool:
+    """Return True if a job with this many workers and source bytes should use a process pool."""
+    return workers > 1 and source_bytes >= POOL_MIN_SOURCE_BYTES
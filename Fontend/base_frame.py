@@ -0,0 +1,289 @@
+import os
+import subprocess
+import sys
+import threading
+import tkinter as tk
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from tkinter import ttk
+from typing import Callable, List, Tuple
+
+# How to hand a folder to the platform's file manager, chosen once at import.
+if os.name == "nt":
+    _system_open = os.startfile
+else:
+    _OPEN_CMD = "open" if sys.platform == "darwin" else "xdg-open"
+
+    def _system_open(path: str) -> None:
+        subprocess.Popen([_OPEN_CMD, path], close_fds=True)
+
+
+class WorkerFrame(ttk.Frame):
+    """Shared scaffolding for screens that run one background job with progress feedback.
+
+    Subclasses build their own widgets, fill ``_action_buttons`` with the buttons to
+    disable while a job runs, and start jobs through ``_start_worker``. The job
+    returns ``(output, message)`` and may report ("progress", pct) with
+    ``_post_event``; the final ("done", output, message) or ("error", message)
+    event is posted when it finishes. A job that watches ``_cancel_evt`` and raises
+    CancelledError ends with ("cancelled", message) instead; ``_cancel_button``, if set, is
+    enabled only while a job runs.
+    """
+
+    # Used in user-facing messages, e.g. "Run combine to generate output first."
+    JOB_NAME = "job"
+    # Vertical padding of each path selector row.
+    PATH_ROW_PADY = 6
+    # How long a success message stays in the status line, in milliseconds.
+    TOAST_MS = 3000
+    # Fallback drain interval while a job runs, in case the worker's event_generate
+    # wake-up cannot reach the UI thread.
+    EVENT_POLL_MS = 100
+    # Shown once Cancel is clicked; jobs stop only between their units of work.
+    CANCEL_PENDING_TEXT = "Cancelling after the current step finishes..."
+
+    def __init__(self, parent: tk.Widget, controller) -> None:
+        super().__init__(parent, padding=18)
+        self.controller = controller
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.output_path_var = tk.StringVar()
+        # Inline validation / "already running" feedback, instead of a modal dialog.
+        self.status_var = tk.StringVar()
+        self._status_label: ttk.Label | None = None
+        # Pending after() job that clears a success toast.
+        self._toast_job: str | None = None
+        # One long-lived worker thread per screen, reused by every run.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.JOB_NAME}-worker")
+        self._future: Future | None = None
+        # Single producer (worker thread), single consumer (Tk thread): deque append and
+        # popleft are atomic, so no lock or queue.Empty handling is needed.
+        self._event_queue: deque[tuple] = deque()
+        # Set while a job runs. The worker polls _cancel_evt between units of work.
+        self._running_evt = threading.Event()
+        self._cancel_evt = threading.Event()
+        self._action_buttons: List[ttk.Button] = []
+        self._cancel_button: ttk.Button | None = None
+        # Shown by the progress_pct label subclasses create; _pct_text mirrors it so
+        # unchanged values skip the Tcl call.
+        self.progress_pct_var = tk.StringVar(value="0%")
+        self._pct_text = "0%"
+        # Event kind -> handler, bound once; each handler takes the full event tuple.
+        self._event_handlers: dict[str, Callable[[tuple], None]] = {
+            "progress": self._handle_progress,
+            "done": self._handle_done,
+            "error": self._handle_error,
+            "cancelled": self._handle_cancelled,
+        }
+        # Newest progress value seen in the current drain batch, drawn once at the end.
+        self._pending_pct: float | None = None
+        # The worker wakes the UI thread with this virtual event after each put.
+        self.bind("<<WorkerEvent>>", self._drain_events)
+        # Pending after() job of the fallback poll (see _poll_events).
+        self._poll_job: str | None = None
+
+    def destroy(self) -> None:
+        # Let the worker thread exit once any running job returns; queued jobs are dropped.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        super().destroy()
+
+    def _add_path_selector(
+        self,
+        parent: ttk.Frame,
+        label_text: str,
+        variable: tk.StringVar,
+        browse_callback,
+        row: int,
+    ) -> None:
+        pady = self.PATH_ROW_PADY
+        label = ttk.Label(parent, text=label_text)
+        label.grid(row=row, column=0, sticky="w", pady=pady, padx=(0, 8))
+
+        entry = ttk.Entry(parent, textvariable=variable)
+        entry.grid(row=row, column=1, sticky="we", pady=pady)
+
+        btn = ttk.Button(
+            parent,
+            text="Browse",
+            width=7,
+            command=lambda: browse_callback(variable),
+            style="Card.TButton",
+        )
+        btn.grid(row=row, column=2, sticky="e", pady=pady, padx=(8, 0))
+
+    def _browse_directory(self, target: tk.StringVar) -> None:
+        # Dialog modules are imported on first use to keep start-up light.
+        from tkinter import filedialog
+
+        path = filedialog.askdirectory(title="Select folder")
+        if path:
+            target.set(path)
+
+    def _add_status_label(self, parent: ttk.Frame, row: int) -> None:
+        self._status_label = ttk.Label(parent, textvariable=self.status_var, foreground="#c0392b")
+        self._status_label.grid(row=row, column=0, columnspan=3, sticky="w", pady=(8, 0))
+
+    def _show_status(self, text: str, foreground: str = "#c0392b") -> None:
+        # Any new status replaces a pending toast, so its timer must not clear it.
+        if self._toast_job is not None:
+            self.after_cancel(self._toast_job)
+            self._toast_job = None
+        if self._status_label is not None:
+            self._status_label.configure(foreground=foreground)
+        self.status_var.set(text)
+
+    def _show_toast(self, text: str) -> None:
+        """Show a success message in the status line that clears itself after TOAST_MS."""
+        self._show_status(text, foreground="#1e8449")
+        self._toast_job = self.after(self.TOAST_MS, self._clear_toast)
+
+    def _clear_toast(self) -> None:
+        self._toast_job = None
+        self.status_var.set("")
+
+    def _set_progress(self, pct: float) -> None:
+        self.progress_var.set(pct)
+        # Only touch the label when the rounded percent it shows actually changes.
+        text = f"{pct:.0f}%"
+        if text != self._pct_text:
+            self._pct_text = text
+            self.progress_pct_var.set(text)
+
+    def _start_worker(self, target: Callable[..., Tuple[str, str]], args: tuple) -> None:
+        """Reset the progress UI, disable the action buttons and run ``target`` on the worker thread."""
+        self._show_status("")
+        self._set_progress(0)
+        self.output_path_var.set("")
+        self._cancel_evt.clear()
+        self._running_evt.set()
+        for button in self._action_buttons:
+            button.state(["disabled"])
+        if self._cancel_button is not None:
+            self._cancel_button.state(["!disabled"])
+
+        self._future = self._executor.submit(target, *args)
+        self._future.add_done_callback(self._on_worker_finished)
+        if self._poll_job is None:
+            self._poll_job = self.after(self.EVENT_POLL_MS, self._poll_events)
+
+    def _on_worker_finished(self, future: Future) -> None:
+        # Called on the worker thread; hand the outcome to the UI thread as an event.
+        exc = future.exception()
+        if isinstance(exc, CancelledError):
+            self._post_event("cancelled", str(exc) or f"{self.JOB_NAME.capitalize()} cancelled.")
+        elif exc is not None:
+            self._post_event("error", str(exc))
+        else:
+            output, message = future.result()
+            self._post_event("done", output, message)
+
+    def _post_event(self, *event: float | str) -> None:
+        """Queue an event from the worker thread and wake the UI thread to handle it."""
+        self._event_queue.append(event)
+        try:
+            self.event_generate("<<WorkerEvent>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # Tk may refuse calls from this thread while the window is still open
+            # ("main thread is not in main loop"); the event then stays queued for
+            # _poll_events. Only a closed window makes the queued events moot.
+            try:
+                closed = not self.winfo_exists()
+            except (tk.TclError, RuntimeError):
+                closed = False
+            if closed:
+                self._event_queue.clear()
+
+    def _poll_events(self) -> None:
+        # UI-thread fallback for a missed wake-up: drain every EVENT_POLL_MS while a
+        # job runs, and once more after it ends so its final event is handled.
+        self._poll_job = None
+        if self._event_queue:
+            self._drain_events()
+        if self._running_evt.is_set() or self._event_queue:
+            self._poll_job = self.after(self.EVENT_POLL_MS, self._poll_events)
+
+    def _drain_events(self, _event: tk.Event | None = None) -> None:
+        # Drain worker events and update UI safely from the main thread.
+        # Only the newest progress value in a batch is drawn.
+        self._pending_pct = None
+        events = self._event_queue
+        handlers = self._event_handlers
+        while events:
+            event_payload = events.popleft()
+            handler = handlers.get(event_payload[0])
+            if handler:
+                handler(event_payload)
+
+        if self._pending_pct is not None:
+            self._set_progress(self._pending_pct)
+            self._pending_pct = None
+
+    def _handle_progress(self, event_payload: tuple) -> None:
+        self._pending_pct = float(event_payload[1])
+
+    def _handle_done(self, event_payload: tuple) -> None:
+        self._pending_pct = None
+        _, output, message = event_payload
+        self._set_progress(100)
+        self.output_path_var.set(str(output))
+        self._on_complete(success=True, message=message)
+
+    def _handle_error(self, event_payload: tuple) -> None:
+        self._pending_pct = None
+        _, err = event_payload
+        self._on_complete(success=False, message=str(err))
+
+    def _handle_cancelled(self, event_payload: tuple) -> None:
+        self._pending_pct = None
+        _, message = event_payload
+        self._finish_run()
+        self._show_status(message)
+
+    def _request_cancel(self) -> None:
+        # The worker stops at its next check; the "cancelled" event re-enables the UI.
+        if self._running_evt.is_set():
+            self._cancel_evt.set()
+            if self._cancel_button is not None:
+                self._cancel_button.state(["disabled"])
+            self._show_status(self.CANCEL_PENDING_TEXT)
+
+    def _finish_run(self) -> None:
+        self._running_evt.clear()
+        for button in self._action_buttons:
+            button.state(["!disabled"])
+        if self._cancel_button is not None:
+            self._cancel_button.state(["disabled"])
+
+    def _on_complete(self, success: bool, message: str) -> None:
+        self._finish_run()
+        if success:
+            # Non-modal, so the next run can start straight away.
+            self._show_toast(message)
+        else:
+            from tkinter import messagebox
+
+            messagebox.showerror("Error", message)
+
+    def _open_output_folder(self) -> None:
+        from tkinter import messagebox
+
+        path = self.output_path_var.get()
+        if not path:
+            messagebox.showinfo("No output", f"Run {self.JOB_NAME} to generate output first.")
+            return
+
+        if os.path.isdir(path):
+            self._open_path(path)
+        else:
+            messagebox.showinfo("Not found", "The output folder does not exist.")
+
+    @staticmethod
+    def _open_path(path: str) -> None:
+        try:
+            _system_open(path)
+        except Exception as exc:  # pragma: no cover - defensive UI error handling
+            from tkinter import messagebox
+
+            messagebox.showerror("Unable to open", str(exc))
@@ -1,20 +1,141 @@
 import csv
-import json
 import os
-import queue
 import sys
 import threading
 import time
 import tkinter as tk
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ProcessPoolExecutor, wait
+from itertools import takewhile
+from multiprocessing import get_context
 from pathlib import Path
-from tkinter import filedialog, messagebox, ttk
-from typing import Callable, Iterable, List
+from tkinter import ttk
+from typing import Callable, Iterable, List, Tuple
 
-from openpyxl import load_workbook
+# Ensure backend module is importable when running from Fontend.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from Backend.process_pool import use_process_pool  # type: ignore
+from base_frame import WorkerFrame
+from settings_store import load_section, save_section
+
+
+# Minimum gap between progress reports (~30 per second); see convert_path.
+PROGRESS_MIN_INTERVAL = 0.033
 
 
 def _row_is_empty(row: Iterable[object | None]) -> bool:
-    return all(cell is None or (isinstance(cell, str) and cell.strip() == "") for cell in row)
+    # Stops at the first real value; isspace() avoids building a stripped copy.
+    for cell in row:
+        if cell is None:
+            continue
+        if type(cell) is not str or (cell and not cell.isspace()):
+            return False
+    return True
+
+
+def _write_sheet_csv(ws, first_row: int, out_file: str) -> None:
+    """Write ``ws`` from ``first_row`` up to (not including) its first empty row as CSV."""
+    # The default argument makes _row_is_empty a fast local lookup inside the per-row predicate.
+    def keep(row: Iterable[object | None], row_is_empty: Callable[..., bool] = _row_is_empty) -> bool:
+        return not row_is_empty(row)
+
+    # A 1 MiB buffer turns the many small row writes into a few large ones.
+    with open(out_file, "w", newline="", encoding="utf-8", buffering=1 << 20) as fh:
+        # Written in one call; csv already writes None as "".
+        rows = ws.iter_rows(min_row=first_row, values_only=True)
+        csv.writer(fh).writerows(takewhile(keep, rows))
+
+
+def _convert_workbook(workbook_path: Path, output_dir: Path, targets: List[Tuple[str, int]]) -> List[str]:
+    """Export each (sheet, first row) target of one workbook to its own CSV file.
+
+    Kept at module level so it can be pickled into worker processes. Output paths
+    are plain strings; convert_path turns them into Path objects once at the end.
+    """
+    # Imported on first use so opening the Convert screen does not pay for openpyxl.
+    from openpyxl import load_workbook
+
+    outputs: List[str] = []
+    out_dir = os.fspath(output_dir)
+    stem = workbook_path.stem
+    # read_only streams rows from the sheet XML instead of building every cell up front.
+    wb = load_workbook(workbook_path, data_only=True, read_only=True)
+    # A read-only workbook keeps the file open until closed, so close it on every path.
+    try:
+        # wb.sheetnames builds a new list on every access; read it once per workbook.
+        sheetnames = set(wb.sheetnames)
+        for sheet_name, first_row in targets:
+            if sheet_name not in sheetnames:
+                raise ValueError(f"Sheet '{sheet_name}' not found in {workbook_path.name}")
+
+            out_file = os.path.join(out_dir, f"{stem}_{sheet_name.replace(' ', '_')}.csv")
+            _write_sheet_csv(wb[sheet_name], first_row, out_file)
+            outputs.append(out_file)
+    finally:
+        wb.close()
+    return outputs
+
+
+class _ProgressThrottle:
+    """Forward progress only in whole-percent steps and at most every PROGRESS_MIN_INTERVAL.
+
+    A value held back by the interval is sent by a timer once the interval has
+    passed, so the percentage shown is never more than one interval behind, even
+    while one large workbook blocks the caller.
+    """
+
+    def __init__(self, progress_cb: Callable[[float], None]) -> None:
+        self._progress_cb = progress_cb
+        # update() runs on the converting thread, _send_pending on the timer's.
+        self._lock = threading.Lock()
+        self._last_pct = 0.0
+        self._last_report = 0.0
+        self._pending: float | None = None
+        self._timer: threading.Timer | None = None
+
+    def update(self, pct: float) -> None:
+        with self._lock:
+            if pct - self._last_pct < 1.0:
+                return
+            delay = self._last_report + PROGRESS_MIN_INTERVAL - time.monotonic()
+            if delay <= 0:
+                self._send(pct)
+                return
+            self._pending = pct
+            if self._timer is None:
+                self._timer = threading.Timer(delay, self._send_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def close(self) -> None:
+        """Stop the timer and drop any value still held back."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+
+    def finish(self) -> None:
+        """Close, then send 100 unless it was already the last value sent."""
+        self.close()
+        with self._lock:
+            if self._last_pct < 100.0:
+                self._send(100.0)
+
+    def _send_pending(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._pending is not None:
+                self._send(self._pending)
+
+    def _send(self, pct: float) -> None:
+        # Called with _lock held.
+        self._pending = None
+        self._last_pct = pct
+        self._last_report = time.monotonic()
+        self._progress_cb(pct)
 
 
 def convert_path(
@@ -24,12 +145,23 @@ def convert_path(
     start_row: int,
     progress_cb: Callable[[float], None] | None = None,
     combie_duo: bool = True,
+    cancel: threading.Event | None = None,
 ) -> List[Path]:
     """Convert a single Excel file or every Excel file in a folder to CSV outputs.
 
     The primary export targets the given ``sheet`` starting at ``start_row``.
     When ``combie_duo`` is True, an additional export of the "Aviti Manifest"
     sheet (starting at row 16) is produced for each workbook.
+
+    A workbook that fails does not stop the rest of a folder. Once every workbook
+    has been tried, failures are reported in one RuntimeError that names each
+    failed workbook (the original exception is chained for a single failure).
+
+    If ``cancel`` is set, workbooks not yet started are skipped and CancelledError
+    is raised once the running ones finish, counting converted and failed workbooks
+    and naming each failure; CSV files already written are left in place. A workbook is never stopped part-way, so a single-file (or in-process)
+    run only stops between workbooks. If every workbook had already started, the
+    run finishes and reports as usual.
     """
 
     if not input_path.exists():
@@ -37,68 +169,123 @@ def convert_path(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    work_items: List[Path]
+    # (workbook, size in bytes); sizes weight the progress so large files count for more.
+    work_items: List[Tuple[Path, int]]
     if input_path.is_dir():
-        work_items = [p for p in sorted(input_path.glob("*.xlsx")) if not p.name.startswith("~$")]
+        # One scandir pass; DirEntry.is_file() uses the cached directory entry type
+        # (and on Windows, DirEntry.stat() needs no extra system call either).
+        # The suffix check ignores case, as glob does on Windows.
+        with os.scandir(input_path) as entries:
+            work_items = sorted(
+                (Path(entry.path), entry.stat().st_size)
+                for entry in entries
+                if entry.name.lower().endswith(".xlsx") and not entry.name.startswith("~$") and entry.is_file()
+            )
     else:
-        work_items = [input_path]
+        work_items = [(input_path, input_path.stat().st_size)]
 
     if not work_items:
         raise FileNotFoundError("No .xlsx files found to convert.")
 
-    outputs: List[Path] = []
-    total_exports = len(work_items) * (2 if combie_duo else 1)
-    completed = 0
-
-    def notify_progress() -> None:
-        if progress_cb and total_exports:
-            pct = min(100.0, max(0.0, (completed / total_exports) * 100.0))
-            progress_cb(pct)
+    targets = [(sheet, start_row)]
+    if combie_duo:
+        targets.append(("Aviti Manifest", 16))
 
-    for workbook_path in work_items:
-        wb = load_workbook(workbook_path, data_only=True)
-        targets = [(sheet, start_row)]
-        if combie_duo:
-            targets.append(("Aviti Manifest", 16))
-
-        for sheet_name, first_row in targets:
-            if sheet_name not in wb.sheetnames:
-                wb.close()
-                raise ValueError(f"Sheet '{sheet_name}' not found in {workbook_path.name}")
+    outputs: List[str] = []
+    failures: List[Tuple[Path, Exception]] = []
+    # Empty files still count as one byte so they move the bar.
+    weights = [max(size, 1) for _, size in work_items]
+    total_bytes = sum(weights)
+    done_bytes = 0
+    # A final 100 is sent below once the run completes.
+    throttle = _ProgressThrottle(progress_cb) if progress_cb else None
 
-            ws = wb[sheet_name]
-            out_file = output_dir / f"{workbook_path.stem}_{sheet_name.replace(' ', '_')}.csv"
-            with out_file.open("w", newline="", encoding="utf-8") as fh:
-                writer = csv.writer(fh)
-                for row in ws.iter_rows(min_row=first_row, values_only=True):
-                    if _row_is_empty(row):
+    def notify_progress() -> None:
+        if throttle is not None:
+            throttle.update(min(100.0, max(0.0, (done_bytes / total_bytes) * 100.0)))
+
+    # Workbooks are independent, so spread a folder over processes; with a
+    # single workbook or CPU, or a small folder, the worker start-up cost is not worth it.
+    workers = min(len(work_items), os.cpu_count() or 1)
+    # Workbooks handed to a worker so far, in order; the rest are skipped on cancel.
+    started = 0
+
+    def cancel_requested() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    try:
+        if not use_process_pool(workers, total_bytes):
+            for (workbook_path, _), weight in zip(work_items, weights):
+                if cancel_requested():
+                    break
+                started += 1
+                try:
+                    outputs.extend(_convert_workbook(workbook_path, output_dir, targets))
+                except Exception as exc:
+                    failures.append((workbook_path, exc))
+                done_bytes += weight
+                notify_progress()
+        else:
+            # spawn (not fork): convert_path is called from a UI worker thread.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+                # Keep only `workers` workbooks in flight and submit the next one as each
+                # finishes, so a cancel skips everything that has not started yet.
+                futures: List[Future] = []
+                weight_of: dict[Future, int] = {}
+                in_flight: set[Future] = set()
+                while True:
+                    while len(in_flight) < workers and started < len(work_items) and not cancel_requested():
+                        future = pool.submit(_convert_workbook, work_items[started][0], output_dir, targets)
+                        futures.append(future)
+                        weight_of[future] = weights[started]
+                        in_flight.add(future)
+                        started += 1
+                    if not in_flight:
                         break
-                    writer.writerow([cell if cell is not None else "" for cell in row])
-
-            outputs.append(out_file)
-            completed += 1
-            notify_progress()
-
-        wb.close()
-
-    if progress_cb:
-        progress_cb(100.0)
-
-    return outputs
-
-class ConvertFrame(ttk.Frame):
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done_bytes += weight_of[future]
+                        notify_progress()
+            # Outputs keep workbook order; failed workbooks are collected, not raised.
+            for (workbook_path, _), future in zip(work_items, futures):
+                exc = future.exception()
+                if exc is None:
+                    outputs.extend(future.result())
+                else:
+                    failures.append((workbook_path, exc))
+    finally:
+        # No late progress from the timer once convert_path is done with it.
+        if throttle is not None:
+            throttle.close()
+
+    details = "\n".join(f"{path.name}: {exc}" for path, exc in failures)
+    if started < len(work_items):
+        # Failures of the workbooks that did run are still reported.
+        converted = started - len(failures)
+        message = f"Convert cancelled: {converted} of {len(work_items)} converted"
+        message += f", {len(failures)} failed:\n{details}" if failures else "."
+        raise CancelledError(message)
+
+    if throttle is not None:
+        throttle.finish()
+
+    if len(failures) == 1:
+        failed_path, exc = failures[0]
+        raise RuntimeError(f"{failed_path.name}: {exc}") from exc
+    if failures:
+        raise RuntimeError(f"{len(failures)} of {len(work_items)} workbooks failed to convert:\n{details}")
+
+    return [Path(p) for p in outputs]
+
+class ConvertFrame(WorkerFrame):
     """Screen for converting data with file or folder workflows."""
 
-    def __init__(self, parent: tk.Widget, controller) -> None:
-        super().__init__(parent, padding=18)
-        self.controller = controller
-        self._settings_path = Path(__file__).resolve().parent / "settings.json"
+    JOB_NAME = "convert"
+    # convert_path never stops inside a workbook.
+    CANCEL_PENDING_TEXT = "Cancelling; workbooks already being converted will finish first."
 
-        self.progress_var = tk.DoubleVar(value=0.0)
-        self.output_path_var = tk.StringVar()
-        self._worker_thread: threading.Thread | None = None
-        self._event_queue: queue.Queue[tuple[str, float | str]] = queue.Queue()
-        self._running = False
+    def __init__(self, parent: tk.Widget, controller) -> None:
+        super().__init__(parent, controller)
 
         self.input_file_var = tk.StringVar()
         self.input_folder_var = tk.StringVar()
@@ -106,6 +293,11 @@ class ConvertFrame(ttk.Frame):
         self.combie_duo_var = tk.BooleanVar(value=True)
 
         self._load_settings()
+        # Stripped inputs of the last started run; any edit clears it (set after loading
+        # so the saved values do not count as edits).
+        self._cached_inputs: dict | None = None
+        for var in (self.input_file_var, self.input_folder_var, self.output_var, self.combie_duo_var):
+            var.trace_add("write", self._invalidate_inputs)
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -148,6 +340,11 @@ class ConvertFrame(ttk.Frame):
             command=lambda: self._start_convert(mode="folder"),
         )
         self.convert_folder_btn.pack(side=tk.LEFT)
+        self._action_buttons = [self.convert_file_btn, self.convert_folder_btn]
+
+        self._cancel_button = ttk.Button(action_row, text="Cancel", command=self._request_cancel)
+        self._cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+        self._cancel_button.state(["disabled"])
 
         # Options
         options_row = ttk.Frame(form)
@@ -167,7 +364,7 @@ class ConvertFrame(ttk.Frame):
         ttk.Label(progress_row, text="Progress:").pack(side=tk.LEFT, padx=(0, 8))
         self.progress = ttk.Progressbar(progress_row, variable=self.progress_var, maximum=100)
         self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        self.progress_pct = ttk.Label(progress_row, text="0%")
+        self.progress_pct = ttk.Label(progress_row, textvariable=self.progress_pct_var)
         self.progress_pct.pack(side=tk.LEFT, padx=(8, 0))
 
         # Output row with open-folder helper.
@@ -178,176 +375,78 @@ class ConvertFrame(ttk.Frame):
         self.output_path_display.pack(side=tk.LEFT, fill=tk.X, expand=True)
         ttk.Button(result_row, text="Open Output Folder", command=self._open_output_folder).pack(side=tk.LEFT, padx=(8, 0))
 
-    def _add_path_selector(
-        self,
-        parent: ttk.Frame,
-        label_text: str,
-        variable: tk.StringVar,
-        browse_callback,
-        row: int,
-    ) -> None:
-        label = ttk.Label(parent, text=label_text)
-        label.grid(row=row, column=0, sticky="w", pady=6, padx=(0, 8))
-
-        entry = ttk.Entry(parent, textvariable=variable)
-        entry.grid(row=row, column=1, sticky="we", pady=6)
-
-        btn = ttk.Button(
-            parent,
-            text="Browse",
-            width=7,
-            command=lambda: browse_callback(variable),
-            style="Card.TButton",
-        )
-        btn.grid(row=row, column=2, sticky="e", pady=6, padx=(8, 0))
+        self._add_status_label(form, row=7)
 
     def _browse_file(self, target: tk.StringVar) -> None:
-        path = filedialog.askopenfilename(title="Select file to convert")
-        if path:
-            target.set(path)
+        from tkinter import filedialog
 
-    def _browse_directory(self, target: tk.StringVar) -> None:
-        path = filedialog.askdirectory(title="Select folder")
+        path = filedialog.askopenfilename(title="Select file to convert")
         if path:
             target.set(path)
 
     def _start_convert(self, mode: str) -> None:
         # Kick off background conversion (file or folder) to keep UI responsive.
-        if self._running:
-            messagebox.showinfo("In progress", "Please wait until the current convert finishes.")
+        if self._running_evt.is_set():
+            self._show_status("Please wait until the current convert finishes.")
             return
 
-        output = self.output_var.get().strip()
-        input_path = self.input_file_var.get().strip() if mode == "file" else self.input_folder_var.get().strip()
+        # Nothing edited since the last run: reuse its values, which are already saved.
+        values = self._cached_inputs
+        fresh = values is None
+        if values is None:
+            values = {
+                "input_file": self.input_file_var.get().strip(),
+                "input_folder": self.input_folder_var.get().strip(),
+                "output": self.output_var.get().strip(),
+                "combie_duo": self.combie_duo_var.get(),
+            }
+
+        output = values["output"]
+        input_path = values["input_file"] if mode == "file" else values["input_folder"]
 
         if not (input_path and output):
-            messagebox.showwarning("Missing input", "Please provide input and output paths before starting.")
+            self._show_status("Please provide input and output paths before starting.")
             return
 
         input_path_obj = Path(input_path)
         output_path_obj = Path(output)
 
-        self._save_settings({
-            "input_file": self.input_file_var.get().strip(),
-            "input_folder": self.input_folder_var.get().strip(),
-            "output": output,
-            "combie_duo": self.combie_duo_var.get(),
-        })
-
-        self.progress_var.set(0)
-        self.progress_pct.config(text="0%")
-        self.output_path_var.set("")
-        self._running = True
-        self.convert_file_btn.state(["disabled"])
-        self.convert_folder_btn.state(["disabled"])
-
-        self._worker_thread = threading.Thread(
-            target=self._convert_worker,
-            args=(mode, input_path_obj, output_path_obj),
-            daemon=True,
-        )
-        self._worker_thread.start()
-        self.after(100, self._poll_events)
-
-    def _convert_worker(self, mode: str, input_path: Path, output_path: Path) -> None:
-        try:
-            # Default sheet/start-row for combie outputs
-            sheet = "SampleImport"
-            start_row = 24
-            combie_duo = self.combie_duo_var.get()
-
-            def progress_cb(pct: float) -> None:
-                self._event_queue.put(("progress", pct))
-
-            convert_path(
-                input_path=input_path,
-                output_dir=output_path,
-                sheet=sheet,
-                start_row=start_row,
-                progress_cb=progress_cb,
-                combie_duo=combie_duo,
-            )
+        if fresh:
+            self._save_settings(values)
+            self._cached_inputs = values
 
-            self._event_queue.put(("done", str(output_path), mode))
-        except Exception as exc:  # pragma: no cover - defensive UI error handling
-            self._event_queue.put(("error", str(exc)))
-
-    def _poll_events(self) -> None:
-        # Drain worker events and update UI safely from the main thread.
-        try:
-            while True:
-                event_payload = self._event_queue.get_nowait()
-                event = event_payload[0]
-                if event == "progress":
-                    payload = event_payload[1]
-                    self.progress_var.set(float(payload))
-                    self.progress_pct.config(text=f"{float(payload):.0f}%")
-                elif event == "done":
-                    _, output, mode = event_payload
-                    self.progress_var.set(100)
-                    self.progress_pct.config(text="100%")
-                    self.output_path_var.set(str(output))
-                    self._on_complete(success=True, message=f"Convert {mode} completed.")
-                elif event == "error":
-                    _, err = event_payload
-                    self._on_complete(success=False, message=str(err))
-        except queue.Empty:
-            pass
-
-        if self._running:
-            self.after(100, self._poll_events)
-
-    def _on_complete(self, success: bool, message: str) -> None:
-        self._running = False
-        self.convert_file_btn.state(["!disabled"])
-        self.convert_folder_btn.state(["!disabled"])
-        if success:
-            messagebox.showinfo("Success", message)
-        else:
-            messagebox.showerror("Error", message)
+        self._start_worker(self._convert_worker, (mode, input_path_obj, output_path_obj, values["combie_duo"]))
 
-    def _open_output_folder(self) -> None:
-        path = self.output_path_var.get()
-        if not path:
-            messagebox.showinfo("No output", "Run convert to generate output first.")
-            return
+    def _invalidate_inputs(self, *_trace_args: str) -> None:
+        self._cached_inputs = None
 
-        if os.path.isdir(path):
-            self._open_path(path)
-        else:
-            messagebox.showinfo("Not found", "The output folder does not exist.")
-
-    @staticmethod
-    def _open_path(path: str) -> None:
-        try:
-            if os.name == "nt":
-                os.startfile(path)
-            elif sys.platform == "darwin":
-                os.system(f"open '{path}'")
-            else:
-                os.system(f"xdg-open '{path}'")
-        except Exception as exc:  # pragma: no cover - defensive UI error handling
-            messagebox.showerror("Unable to open", str(exc))
+    def _convert_worker(self, mode: str, input_path: Path, output_path: Path, combie_duo: bool) -> tuple[str, str]:
+        # Default sheet/start-row for combie outputs
+        sheet = "SampleImport"
+        start_row = 24
+
+        def progress_cb(pct: float) -> None:
+            self._post_event("progress", pct)
+
+        convert_path(
+            input_path=input_path,
+            output_dir=output_path,
+            sheet=sheet,
+            start_row=start_row,
+            progress_cb=progress_cb,
+            combie_duo=combie_duo,
+            cancel=self._cancel_evt,
+        )
+
+        return str(output_path), f"Convert {mode} completed."
 
     def _load_settings(self) -> None:
-        try:
-            if not self._settings_path.exists():
-                return
-            data = json.loads(self._settings_path.read_text(encoding="utf-8") or "{}")
-            convert = data.get("convert", {})
-            self.input_file_var.set(convert.get("input_file", ""))
-            self.input_folder_var.set(convert.get("input_folder", ""))
-            self.output_var.set(convert.get("output", ""))
-            self.combie_duo_var.set(convert.get("combie_duo", True))
-        except Exception:
-            pass
+        convert = load_section("convert")
+        self.input_file_var.set(convert.get("input_file", ""))
+        self.input_folder_var.set(convert.get("input_folder", ""))
+        self.output_var.set(convert.get("output", ""))
+        self.combie_duo_var.set(convert.get("combie_duo", True))
 
     def _save_settings(self, convert_data: dict) -> None:
-        try:
-            data = {}
-            if self._settings_path.exists():
-                data = json.loads(self._settings_path.read_text(encoding="utf-8") or "{}")
-            data["convert"] = convert_data
-            self._settings_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-        except Exception:
-            pass
+        # Cached in memory; the file is written on a background thread.
+        save_section("convert", convert_data)
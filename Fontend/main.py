@@ -1,8 +1,14 @@
+import importlib
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 
-from combie import CombineFrame
-from convert import ConvertFrame
+# Workflow screens are imported and built on first visit: both pull in openpyxl,
+# which the home screen does not need. key -> (module, frame class)
+LAZY_FRAMES = {
+    "combine": ("combie", "CombineFrame"),
+    "convert": ("convert", "ConvertFrame"),
+}
 
 
 class App(tk.Tk):
@@ -19,6 +25,7 @@ class App(tk.Tk):
         container = ttk.Frame(self, padding=28, style="Root.TFrame")
         container.pack(fill=tk.BOTH, expand=True)
 
+        self._container = container
         self.frames: dict[str, ttk.Frame] = {}
         self._register_frames(container)
 
@@ -29,14 +36,18 @@ class App(tk.Tk):
 
     def _register_frames(self, container: ttk.Frame) -> None:
         self.frames["home"] = HomeFrame(parent=container, controller=self)
-        self.frames["combine"] = CombineFrame(parent=container, controller=self)
-        self.frames["convert"] = ConvertFrame(parent=container, controller=self)
 
         for frame in self.frames.values():
             frame.grid(row=0, column=0, sticky="nsew")
 
     def show_frame(self, key: str) -> None:
-        frame = self.frames[key]
+        frame = self.frames.get(key)
+        if frame is None:
+            module_name, class_name = LAZY_FRAMES[key]
+            frame_cls = getattr(importlib.import_module(module_name), class_name)
+            frame = frame_cls(parent=self._container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[key] = frame
         frame.tkraise()
 
     def _configure_styles(self) -> None:
@@ -145,4 +156,8 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Combine and Convert run large jobs in spawned worker processes; in a frozen
+    # (PyInstaller) build each worker re-runs this executable, and freeze_support()
+    # hands it to multiprocessing instead of opening another window.
+    multiprocessing.freeze_support()
     main()
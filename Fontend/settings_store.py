@@ -0,0 +1,59 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+SETTINGS_PATH = Path(__file__).resolve().parent / "settings.json"
+
+# Parsed settings.json shared by every screen; loaded on first use.
+_cache: dict | None = None
+_cache_lock = threading.Lock()
+# Serialises background writes so they cannot interleave on disk.
+_write_lock = threading.Lock()
+
+
+def _load_cache() -> dict:
+    """Return the shared settings dict, reading the file the first time. Call with _cache_lock held."""
+    global _cache
+    if _cache is None:
+        data: object = {}
+        try:
+            # A missing or empty file just means nothing has been saved yet.
+            if SETTINGS_PATH.stat().st_size:
+                data = json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # Missing, unreadable or malformed (bad JSON / encoding) settings; start empty
+            # so the UI stays usable.
+            pass
+        _cache = data if isinstance(data, dict) else {}
+    return _cache
+
+
+def load_section(name: str) -> dict:
+    """Return a copy of one screen's saved settings (empty if none)."""
+    with _cache_lock:
+        section = _load_cache().get(name, {})
+    return dict(section) if isinstance(section, dict) else {}
+
+
+def save_section(name: str, values: dict) -> None:
+    """Replace one screen's settings in memory and write the file in the background."""
+    with _cache_lock:
+        _load_cache()[name] = dict(values)
+    threading.Thread(target=_flush, name="settings-flush").start()
+
+
+def _flush() -> None:
+    # Each flush writes the latest cache, so out-of-order threads still leave the newest state on disk.
+    with _write_lock:
+        with _cache_lock:
+            text = json.dumps(_cache, ensure_ascii=False, indent=2)
+        # Write a sibling temp file and swap it in, so a crash mid-write never leaves
+        # a truncated settings.json behind.
+        tmp_path = SETTINGS_PATH.with_name(SETTINGS_PATH.name + ".tmp")
+        try:
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, SETTINGS_PATH)
+        except OSError:
+            # Ignore save errors; do not block the workflow.
+            pass